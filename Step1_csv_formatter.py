@@ -8,7 +8,7 @@ cleaning steps.
 """
 
 import os
-import csv
+import multiprocessing as mp
 
 # --- CONFIG ---
 input_root = "Exports/Daten_Raw"
@@ -26,56 +26,68 @@ def clean_and_convert_file(input_path: str, output_path: str) -> None:
     with semicolons and writes the cleaned file to ``output_path``.
     """
 
+    # First pass: locate the trajectory block and find its widest row
+    traj_found = False
+    max_fields = 1
     try:
         with open(input_path, "r", encoding="cp1252") as f:
-            lines = [line.strip() for line in f if line.strip()]
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if traj_found:
+                    max_fields = max(max_fields, line.count(",") + 1)
+                elif line == "TRAJECTORIES":
+                    traj_found = True
     except UnicodeDecodeError as e:
         print(f"❌ Encoding error in {input_path}: {e}")
         return
 
-    try:
-        traj_start = lines.index("TRAJECTORIES")
-    except ValueError:
+    if not traj_found:
         print(f"❌ 'TRAJECTORIES' not found in: {input_path}")
         return
 
-    field_lines = lines[traj_start + 1:]
-    split_lines = [line.split(",") for line in field_lines]
-    max_fields = max(len(line) for line in split_lines)
-
-    padded_lines = [
-        line + [""] * (max_fields - len(line))
-        for line in split_lines
-    ]
-
-    header_lines = lines[:traj_start]
-    converted_lines = []
-
-    for line in header_lines:
-        if "," in line:
-            parts = line.split(",")
-            converted_lines.append(";".join(parts + [""] * (max_fields - len(parts))))
-        else:
-            converted_lines.append(line + ";" * (max_fields - 1))
-
-    converted_lines.append("TRAJECTORIES" + ";" * (max_fields - 1))
-
-    for line in padded_lines:
-        converted_lines.append(";".join(line))
-
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    with open(output_path, "w", encoding="cp1252", newline="") as f:
-        for line in converted_lines:
-            f.write(line + "\n")
+    # Prebuilt padding: a row with n commas needs suffixes[n] to reach max_fields
+    suffixes = [";" * (max_fields - 1 - n) + "\n" for n in range(max_fields)]
+
+    # Second pass: stream every line straight to the output file; the 1 MiB
+    # buffer keeps the number of write syscalls low
+    with open(input_path, "r", encoding="cp1252") as f_in, \
+            open(output_path, "w", encoding="cp1252", newline="", buffering=1 << 20) as f_out:
+        in_traj = False
+        for line in f_in:
+            line = line.strip()
+            if not line:
+                continue
+
+            if in_traj:
+                # Plain string ops on purpose: csv.reader/writer would build a
+                # list per row (several times slower) and reinterpret quotes
+                f_out.write(line.replace(",", ";") + suffixes[line.count(",")])
+            else:
+                # Header lines may be wider than the trajectory block; those
+                # are written unpadded, exactly as before
+                f_out.write(line.replace(",", ";") + ";" * (max_fields - line.count(",") - 1) + "\n")
+                in_traj = line == "TRAJECTORIES"
 
     print(f"✅ Converted: {input_path} → {output_path}")
 
+def _job(input_path: str) -> None:
+    """Convert one raw export, keeping its path relative to ``input_root``."""
+
+    rel_path = os.path.relpath(input_path, input_root)
+    output_path = os.path.join(output_root, rel_path)
+    clean_and_convert_file(input_path, output_path)
+
 # --- STEP THROUGH ALL CSV FILES ---
-for root, dirs, files in os.walk(input_root):
-    for file in files:
-        if file.lower().endswith(".csv"):
-            input_path = os.path.join(root, file)
-            rel_path = os.path.relpath(input_path, input_root)
-            output_path = os.path.join(output_root, rel_path)
-            clean_and_convert_file(input_path, output_path)
+if __name__ == "__main__":
+    input_paths = [
+        os.path.join(root, file)
+        for root, dirs, files in os.walk(input_root)
+        for file in files
+        if file.lower().endswith(".csv")
+    ]
+    with mp.Pool(mp.cpu_count()) as pool:
+        pool.map(_job, input_paths)
@@ -7,13 +7,19 @@ temporary markers. The cleaned files are written to ``Exports/Daten_Raw_Clean``.
 """
 
 import os
+import multiprocessing as mp
 import pandas as pd
 import numpy as np
 import re
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 # --- CONFIG ---
 input_root = "Exports/Daten_Raw_Formatted"
 output_root = "Exports/Daten_Raw_Clean"
+_MARKER_RE = re.compile(r"\*(\d+)")  # marker header cells like "*1"
+# Every dot that is followed by another dot in the same cell ("127.228.226")
+_THOUSANDS_RE = re.compile(rb"\.(?=[^;\n.]*\.)")
 
 # --- Determine base_markers based on file/folder name ---
 def determine_base_markers(path: str) -> list:
@@ -33,22 +39,46 @@ def determine_base_markers(path: str) -> list:
         print(f"⚠️  Unknown group for: {path} → defaulting to [1]")
         return [1]
 
-# --- Parse custom German decimal format safely ---
-def parse_val(val):
-    """Convert strings with German decimal format to floats.
+# --- Read a formatted CSV file as strings ---
+def read_raw_csv(path: str, skip_rows: int, columns: list) -> pd.DataFrame:
+    """Read the rows of ``path`` after ``skip_rows`` lines as strings.
 
-    The raw data sometimes contains spaces or dots as thousand separators. This
-    helper removes these artefacts and returns ``np.nan`` for invalid numbers.
+    The columns are named ``columns`` directly, so no sliced copy of the whole
+    file is needed. Empty cells become missing values like in pandas.
     """
 
-    try:
-        val = str(val).replace(" ", "")
-        parts = val.split(".")
-        if len(parts) > 2:
-            val = "".join(parts[:-1]) + "." + parts[-1]
-        return float(val)
-    except:  # noqa: E722 - broad catch acceptable for cleaning
-        return np.nan
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(encoding="cp1252", skip_rows=skip_rows, column_names=columns),
+        parse_options=pacsv.ParseOptions(delimiter=";"),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: pa.string() for c in columns},
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
+
+# --- Parse the numeric block of a formatted file ---
+def read_marker_block(data: bytes, columns: list) -> pd.DataFrame:
+    """Parse the data rows below the headers straight into floats.
+
+    German decimal artefacts are removed on the raw bytes first (spaces and
+    every dot except the last one per cell), so Arrow can convert the marker
+    columns to ``float64`` while reading. ``Frame`` is kept as text. Raises
+    ``pyarrow.ArrowInvalid`` if a cell is still not a number.
+    """
+
+    data = _THOUSANDS_RE.sub(b"", data.replace(b" ", b""))
+    table = pacsv.read_csv(
+        pa.py_buffer(data),
+        read_options=pacsv.ReadOptions(column_names=columns),
+        parse_options=pacsv.ParseOptions(delimiter=";"),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: pa.string() if c == "Frame" else pa.float64() for c in columns},
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
 
 # --- Clean a single CSV file ---
 def clean_csv(input_path: str, output_path: str) -> None:
@@ -57,20 +87,27 @@ def clean_csv(input_path: str, output_path: str) -> None:
     base_markers = determine_base_markers(input_path)
 
     try:
-        df_raw = pd.read_csv(input_path, sep=';', header=None, dtype=str, encoding="cp1252")
+        with open(input_path, "rb") as f:
+            raw = f.read()
     except Exception as e:  # pragma: no cover - logging only
         print(f"❌ Failed to read {input_path}: {e}")
         return
 
     try:
-        marker_hdr_idx = df_raw.apply(lambda r: r.str.contains(r"\*1", regex=True, na=False).any(), axis=1).idxmax()
-        coord_hdr_idx = marker_hdr_idx + 1
+        # The marker header sits near the top: the first line containing "*1"
+        hit = raw.find(b"*1")
+        if hit < 0:
+            raise ValueError("no row contains marker '*1'")
+        marker_start = raw.rfind(b"\n", 0, hit) + 1
+        coord_start = raw.index(b"\n", hit) + 1
+        data_start = raw.find(b"\n", coord_start) + 1 or len(raw)
+        coord_hdr_idx = raw.count(b"\n", 0, coord_start)
     except Exception as e:
         print(f"❌ Could not find headers in {input_path}: {e}")
         return
 
-    marker_row = df_raw.iloc[marker_hdr_idx].fillna("")
-    coord_row = df_raw.iloc[coord_hdr_idx].fillna("")
+    marker_row = raw[marker_start:coord_start].decode("cp1252").rstrip("\r\n").split(";")
+    coord_row = raw[coord_start:data_start].decode("cp1252").rstrip("\r\n").split(";")
 
     new_cols = []
     current_marker = None
@@ -82,7 +119,7 @@ def clean_csv(input_path: str, output_path: str) -> None:
             new_cols.append("Frame")
             continue
 
-        m = re.match(r"\*(\d+)", col_val)
+        m = _MARKER_RE.match(col_val)
         if m:
             current_marker = m.group(1)
 
@@ -91,28 +128,49 @@ def clean_csv(input_path: str, output_path: str) -> None:
         else:
             new_cols.append(f"unk_{len(new_cols)}")
 
-    df = df_raw.iloc[coord_hdr_idx + 1:].copy()
-    df.columns = new_cols
-
-    for col in df.columns:
-        if col != "Frame":
-            df[col] = df[col].apply(parse_val)
+    try:
+        df = read_marker_block(raw[data_start:], new_cols)
+    except pa.ArrowInvalid:
+        # Some cell is not a number even after the clean-up: parse the rows as
+        # strings instead and let invalid values become NaN.
+        df = read_raw_csv(input_path, coord_hdr_idx + 1, new_cols)
+
+        # German decimal artefacts: drop spaces and every dot except the last one
+        # ("127.228.226" -> "127228.226"), invalid numbers become NaN.
+        num_cols = [c for c in df.columns if c != "Frame"]
+        block = df[num_cols].apply(
+            lambda s: pd.to_numeric(
+                s.str.replace(" ", "", regex=False).str.replace(r"\.(?=.*\.)", "", regex=True),
+                errors="coerce",
+            )
+        )
+        df[num_cols] = block
 
     all_markers = sorted({int(c.split("_")[0]) for c in df.columns if c != "Frame"})
     extra_markers = [m for m in all_markers if m not in base_markers]
 
-    for row_idx, row in df.iterrows():
-        for e in extra_markers:
-            ex, ey, ez = f"{e}_X", f"{e}_Y", f"{e}_Z"
-            if pd.notna(row.get(ex)) and pd.notna(row.get(ey)) and pd.notna(row.get(ez)):
-                for b in base_markers:
-                    bx, by, bz = f"{b}_X", f"{b}_Y", f"{b}_Z"
-                    if (
-                        bx in df.columns and by in df.columns and bz in df.columns and
-                        pd.isna(row.get(bx)) and pd.isna(row.get(by)) and pd.isna(row.get(bz))
-                    ):
-                        df.loc[row_idx, [bx, by, bz]] = [row[ex], row[ey], row[ez]]
-                        break
+    # Fill frames where a base marker is missing completely with a temporary
+    # marker that has all three coordinates. Each extra marker fills at most
+    # one base marker per frame, the first one (in base order) still missing.
+    base_cols = {
+        b: [f"{b}_X", f"{b}_Y", f"{b}_Z"] for b in base_markers
+        if all(f"{b}_{axis}" in df.columns for axis in ("X", "Y", "Z"))
+    }
+    base_arrs = {b: df[cols].to_numpy(dtype=float, copy=True) for b, cols in base_cols.items()}
+
+    for e in extra_markers:
+        extra_cols = [f"{e}_X", f"{e}_Y", f"{e}_Z"]
+        if not all(c in df.columns for c in extra_cols):
+            continue
+        extra_arr = df[extra_cols].to_numpy(dtype=float)
+        pending = ~np.isnan(extra_arr).any(axis=1)
+        for b, base_arr in base_arrs.items():
+            sel = pending & np.isnan(base_arr).all(axis=1)
+            base_arr[sel] = extra_arr[sel]
+            pending &= ~sel
+
+    for b, cols in base_cols.items():
+        df[cols] = base_arrs[b]
 
     cols_to_drop = [
         f"{e}_{axis}" for e in extra_markers for axis in ("X", "Y", "Z")
@@ -127,11 +185,20 @@ def clean_csv(input_path: str, output_path: str) -> None:
     except Exception as e:
         print(f"❌ Failed to save {output_path}: {e}")
 
+def _job(input_path: str) -> None:
+    """Clean one formatted file into the matching path below ``output_root``."""
+
+    rel_path = os.path.relpath(input_path, input_root)
+    output_path = os.path.join(output_root, rel_path)
+    clean_csv(input_path, output_path)
+
 # --- Walk through all files ---
-for root, dirs, files in os.walk(input_root):
-    for file in files:
-        if file.lower().endswith(".csv"):
-            input_path = os.path.join(root, file)
-            rel_path = os.path.relpath(input_path, input_root)
-            output_path = os.path.join(output_root, rel_path)
-            clean_csv(input_path, output_path)
+if __name__ == "__main__":
+    input_paths = [
+        os.path.join(root, file)
+        for root, dirs, files in os.walk(input_root)
+        for file in files
+        if file.lower().endswith(".csv")
+    ]
+    with mp.Pool(mp.cpu_count()) as pool:
+        pool.map(_job, input_paths)
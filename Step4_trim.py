@@ -1,9 +1,12 @@
 """Truncate recordings once movement stops."""
 
 import os
-import pandas as pd
+import multiprocessing as mp
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from glob import glob
+from numba import njit
 
 # --- CONFIG ---
 input_root = "Exports/Daten_Raw_Interpolated"
@@ -14,56 +17,142 @@ WINDOW_SIZE = 60            # Number of frames for rolling window
 MOVEMENT_THRESHOLD = 3      # Threshold in mm/frame
 
 # --- Helper Function ---
-def compute_trimmed_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Return ``df`` truncated after the last significant movement.
+def open_data(path: str):
+    """Open ``path`` as a stream of Arrow record batches.
 
-    Movement is approximated via a rolling mean over frame-to-frame distances.
-    Once the mean falls below ``MOVEMENT_THRESHOLD`` for the remainder of the
-    recording, trailing frames are removed.
+    Returns the reader and the marker columns. Marker columns are typed as
+    ``float64`` up front, so a column that is empty in the first block does
+    not break later batches.
     """
 
-    original_cols = df.columns.tolist()
-    frame_col = df.columns[0]  # Keep first column (e.g. "Frame")
-    marker_cols = [col for col in df.columns if any(axis in col for axis in ['_X', '_Y', '_Z'])]
+    with open(path, "r", encoding="utf-8") as f:
+        columns = f.readline().rstrip("\r\n").split(DELIMITER)
+    marker_cols = [col for col in columns if any(axis in col for axis in ['_X', '_Y', '_Z'])]
 
-    # For movement detection, use only marker data
-    marker_df = df[marker_cols]
+    reader = pacsv.open_csv(
+        path,
+        parse_options=pacsv.ParseOptions(delimiter=DELIMITER),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: pa.float64() for col in marker_cols},
+            strings_can_be_null=True,
+        ),
+    )
+    return reader, marker_cols
 
-    def frame_distance(row1, row2):
-        return np.linalg.norm(row1 - row2)
+# NaN-safe subset of fastmath: marker gaps must still propagate as NaN
+@njit(cache=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+def trim_scan(arr, window, thresh, recent, prev, seen, total, nan_count, last_active_idx):
+    """Advance the movement scan by one chunk of frames.
 
-    distances = [0.0]
-    for i in range(1, len(marker_df)):
-        distances.append(frame_distance(marker_df.iloc[i], marker_df.iloc[i - 1]))
+    Frame-to-frame distances and their rolling mean over ``window`` frames are
+    computed in a single pass over ``arr``. Windows containing a NaN distance
+    are skipped, like ``pandas.Series.rolling(window).mean()``.
 
-    df["frame_distance"] = distances
-    df["rolling_mean_movement"] = df["frame_distance"].rolling(WINDOW_SIZE).mean()
+    ``recent`` (ring buffer of the last ``window`` distances) and ``prev``
+    (last frame of the previous chunk) are updated in place; the scalar state
+    ``seen``, ``total``, ``nan_count`` and ``last_active_idx`` is returned for
+    the next call. ``last_active_idx`` stays ``-1`` until the rolling mean
+    exceeds ``thresh``.
+    """
 
-    threshold_crossed = df[df["rolling_mean_movement"] > MOVEMENT_THRESHOLD].index
-    if len(threshold_crossed) > 0:
-        last_active_idx = threshold_crossed[-1]
-        df_trimmed = df.iloc[: last_active_idx + 1].copy()
-        print(f"✅ Truncated at frame {last_active_idx} (of {len(df)}).")
-    else:
-        df_trimmed = df.copy()
-        print("⚠️ No truncation — kept full recording.")
+    n, m = arr.shape
+    for r in range(n):
+        i = seen + r
+        dist = 0.0
+        if i > 0:
+            for j in range(m):
+                diff = arr[r, j] - prev[j]
+                dist += diff * diff
+            dist = np.sqrt(dist)
+        for j in range(m):
+            prev[j] = arr[r, j]
 
-    # Drop helper columns before returning
-    return df_trimmed.drop(columns=["frame_distance", "rolling_mean_movement"])
+        slot = i % window
+        if i >= window:
+            old = recent[slot]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                total -= old
+        recent[slot] = dist
+        if np.isnan(dist):
+            nan_count += 1
+        else:
+            total += dist
 
-# --- Main ---
-os.makedirs(output_root, exist_ok=True)
-csv_files = glob(f"{input_root}/**/*.csv", recursive=True)
+        if i >= window - 1 and nan_count == 0 and total / window > thresh:
+            last_active_idx = i
+
+    return seen + n, total, nan_count, last_active_idx
+
+def find_last_active_frame(path: str):
+    """Return the last significantly moving frame of ``path`` and its length.
+
+    Movement is approximated via a rolling mean over frame-to-frame distances.
+    The file is streamed batch by batch, so only the rolling window is kept in
+    memory. The frame index is ``-1`` if the mean never exceeds
+    ``MOVEMENT_THRESHOLD``.
+    """
+
+    reader, marker_cols = open_data(path)
+    recent = np.zeros(WINDOW_SIZE)
+    # For movement detection, use only marker data; float32 halves the memory
+    # traffic and is far below the mm-level noise (the kernel sums in float64)
+    prev = np.zeros(len(marker_cols), dtype=np.float32)
+    seen, total, nan_count, last_active_idx = 0, 0.0, 0, -1
+
+    for batch in reader:
+        arr = np.empty((batch.num_rows, len(marker_cols)), dtype=np.float32)
+        for k, col in enumerate(marker_cols):
+            arr[:, k] = batch.column(col).to_numpy(zero_copy_only=False)
+        seen, total, nan_count, last_active_idx = trim_scan(
+            arr, WINDOW_SIZE, MOVEMENT_THRESHOLD, recent, prev,
+            seen, total, nan_count, last_active_idx,
+        )
+
+    return last_active_idx, seen
+
+def write_trimmed(path: str, save_path: str, n_rows: int) -> None:
+    """Stream the first ``n_rows`` frames of ``path`` to ``save_path``."""
+
+    reader, _ = open_data(path)
+    written = 0
+    header = True
+    with open(save_path, "w", encoding="utf-8", newline="") as f:
+        for batch in reader:
+            chunk = batch.slice(0, n_rows - written)
+            chunk.to_pandas().to_csv(f, sep=DELIMITER, index=False, header=header)
+            header = False
+            written += chunk.num_rows
+            if written >= n_rows:
+                break
+        if header:  # recording without any frames
+            reader.schema.empty_table().to_pandas().to_csv(f, sep=DELIMITER, index=False)
+
+def _job(path: str) -> None:
+    """Trim a single recording and save it to ``output_root``."""
 
-for path in csv_files:
     try:
         print(f"\n📄 Processing: {path}")
-        df = pd.read_csv(path, delimiter=DELIMITER)
-        trimmed_df = compute_trimmed_df(df)
+        last_active_idx, n_frames = find_last_active_frame(path)
+        if last_active_idx >= 0:
+            n_rows = last_active_idx + 1
+            print(f"✅ Truncated at frame {last_active_idx} (of {n_frames}).")
+        else:
+            n_rows = n_frames
+            print("⚠️ No truncation — kept full recording.")
 
         base_name = os.path.basename(path).replace(".csv", "_trimmed.csv")
         save_path = os.path.join(output_root, base_name)
-        trimmed_df.to_csv(save_path, sep=DELIMITER, index=False)
+        write_trimmed(path, save_path, n_rows)
         print(f"📁 Saved: {save_path}")
     except Exception as e:
         print(f"❌ Error processing {path}: {e}")
+
+# --- Main ---
+if __name__ == "__main__":
+    os.makedirs(output_root, exist_ok=True)
+    csv_files = glob(f"{input_root}/**/*.csv", recursive=True)
+
+    with mp.Pool(mp.cpu_count()) as pool:
+        pool.map(_job, csv_files)
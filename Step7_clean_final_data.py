@@ -1,8 +1,12 @@
 """Apply Savitzky–Golay smoothing to final averaged trajectories."""
 
 import os
+import re
+import multiprocessing as mp
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from glob import glob
 from scipy.signal import savgol_filter
 
@@ -12,31 +16,76 @@ OUTPUT_DIR = "Exports/Final_Cleaned"
 DELIMITER = ";"
 WINDOW_SIZE = 11   # must be odd, controls smoothness
 POLY_ORDER = 2     # typically 2 or 3
+AXES = ("X", "Y", "Z")
 
-# --- Setup ---
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-input_files = glob(f"{INPUT_DIR}/*_final_mean.csv")
+# --- Helper Function ---
+def load_data(path: str) -> pd.DataFrame:
+    """Read a semicolon separated file with Arrow's multithreaded CSV parser.
+
+    Smoothing needs the whole signal, so the file is read at once, but every
+    column except ``Frame`` is parsed straight to ``float32`` to halve memory.
+    """
+
+    with open(path, "r", encoding="utf-8") as f:
+        columns = f.readline().rstrip("\r\n").split(DELIMITER)
+
+    table = pacsv.read_csv(
+        path,
+        parse_options=pacsv.ParseOptions(delimiter=DELIMITER),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: pa.float32() for col in columns if col.lower() != "frame"},
+            strings_can_be_null=True,
+        ),
+    )
+    # Arrow types columns without any value as null; pandas reads them as NaN
+    empty = [f.name for f in table.schema if pa.types.is_null(f.type)]
+    return table.to_pandas().astype({c: float for c in empty})
+
+def to_positions(df: pd.DataFrame):
+    """Return marker IDs and an ``(frames, markers, 3)`` float32 position array.
+
+    Only markers with all three axis columns (``<id>_X`` …) are included.
+    """
+
+    ids = sorted({int(c.split("_")[0]) for c in df.columns if re.fullmatch(r"\d+_[XYZ]", c)})
+    ids = [m for m in ids if all(f"{m}_{axis}" in df.columns for axis in AXES)]
+    cols = [f"{m}_{axis}" for m in ids for axis in AXES]
+    pos = df[cols].to_numpy(dtype=np.float32).reshape(len(df), len(ids), 3)
+    return np.array(ids, dtype=np.int32), pos
+
+def _job(path: str) -> None:
+    """Smooth every marker column of ``path`` and write the result."""
 
-for path in input_files:
     try:
         print(f"\n🧹 Cleaning file: {os.path.basename(path)}")
-        df = pd.read_csv(path, delimiter=DELIMITER)
+        df = load_data(path)
         cleaned_df = df.copy()
 
-        for col in df.columns:
-            if col.lower() == "frame":
-                continue
-            series = df[col].astype(float)
-            if series.isna().all():
-                continue
-            # Fill NaNs temporarily to smooth
-            filled = series.interpolate(limit_direction='both')
-            smoothed = savgol_filter(filled, window_length=min(WINDOW_SIZE, len(filled)//2*2+1), polyorder=POLY_ORDER)
-            cleaned_df[col] = smoothed
+        # float32 is plenty for mm trajectories and halves the filter's memory traffic
+        data = df[[col for col in df.columns if col.lower() != "frame"]].astype(np.float32)
+        cols = [col for col in data.columns if not data[col].isna().all()]
+        if cols:
+            # Fill NaNs temporarily to smooth, then filter all columns in one call.
+            # All columns share the file length and thus one window, and files
+            # already run in separate processes, so no per-column threads.
+            filled = data[cols].interpolate(limit_direction='both').to_numpy()
+            smoothed = savgol_filter(filled, window_length=min(WINDOW_SIZE, len(filled)//2*2+1), polyorder=POLY_ORDER, axis=0)
+            cleaned_df[cols] = smoothed
 
         # Save
         out_path = os.path.join(OUTPUT_DIR, os.path.basename(path).replace("_final_mean.csv", "_final_clean.csv"))
         cleaned_df.to_csv(out_path, sep=DELIMITER, index=False)
+        # Array copy for Step8, which then skips CSV parsing entirely
+        ids, pos = to_positions(cleaned_df)
+        np.savez(out_path.replace(".csv", ".npz"), pos=pos, frame=cleaned_df["Frame"].to_numpy(), ids=ids)
         print(f"✅ Cleaned and saved: {out_path}")
     except Exception as e:
         print(f"❌ Failed to clean {path}: {e}")
+
+# --- Setup ---
+if __name__ == "__main__":
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    input_files = glob(f"{INPUT_DIR}/*_final_mean.csv")
+
+    with mp.Pool(mp.cpu_count()) as pool:
+        pool.map(_job, input_files)
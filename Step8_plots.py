@@ -1,8 +1,10 @@
 """Plot scalar velocity and acceleration for each marker."""
 
 import os
-import pandas as pd
+import multiprocessing as mp
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # workers only save figures, no GUI backend needed
 import matplotlib.pyplot as plt
 from glob import glob
 from scipy.signal import savgol_filter
@@ -10,59 +12,60 @@ from scipy.signal import savgol_filter
 # --- CONFIG ---
 INPUT_DIR = "Exports/Final_Cleaned"
 OUTPUT_DIR = "Exports/Plots"
-DELIMITER = ";"
 MARKERS = [1, 2, 3, 4, 5]
-AXES = ["X", "Y", "Z"]
 
-# --- Setup ---
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-files = glob(f"{INPUT_DIR}/*_final_clean.csv")
-
-def compute_scalar_velocity_and_acceleration(df: pd.DataFrame, marker_id: int):
-    """Return smoothed velocity and acceleration magnitudes for ``marker_id``."""
-
-    vs = []
-    accs = []
-    for axis in AXES:
-        col = f"{marker_id}_{axis}"
-        if col in df.columns:
-            pos = df[col].astype(float).values
-            v = np.gradient(pos)
-            a = np.gradient(v)
-            vs.append(v)
-            accs.append(a)
-    if len(vs) == 3:
-        vel_norm = np.sqrt(vs[0] ** 2 + vs[1] ** 2 + vs[2] ** 2)
-        acc_norm = np.sqrt(accs[0] ** 2 + accs[1] ** 2 + accs[2] ** 2)
-
-        # Smooth the results using Savitzky-Golay filter
-        window_v = 9 if len(vel_norm) >= 9 else len(vel_norm) // 2 * 2 + 1
-        window_a = 15 if len(acc_norm) >= 15 else len(acc_norm) // 2 * 2 + 1
-
-        vel_smooth = savgol_filter(vel_norm, window_length=window_v, polyorder=3)
-        acc_smooth = savgol_filter(acc_norm, window_length=window_a, polyorder=3)
-
-        return vel_smooth, acc_smooth
-    else:
-        return None, None
+def load_positions(path: str):
+    """Return frame, marker IDs and ``(frames, markers, 3)`` positions from Step7."""
+
+    with np.load(path) as data:
+        return data["frame"], data["ids"], data["pos"]
+
+def compute_scalar_velocity_and_acceleration(pos: np.ndarray, ids: np.ndarray, marker_ids: list):
+    """Return smoothed velocity and acceleration magnitudes for ``marker_ids``.
+
+    Markers missing from ``ids`` are skipped. The result is the list of
+    plotted marker IDs and two ``(frames, markers)`` arrays whose columns
+    follow that list; all markers are smoothed in a single filter call.
+    """
+
+    index = {int(m): k for k, m in enumerate(ids)}
+    found = [marker_id for marker_id in marker_ids if marker_id in index]
+    if not found:
+        return found, None, None
+
+    # One gradient call per derivative for all markers and axes at once
+    marker_pos = pos[:, [index[marker_id] for marker_id in found], :]
+    v = np.gradient(marker_pos, axis=0)
+    a = np.gradient(v, axis=0)
+    vel_norm = np.linalg.norm(v, axis=-1)
+    acc_norm = np.linalg.norm(a, axis=-1)
+
+    # Smooth the results using Savitzky-Golay filter
+    window_v = 9 if len(vel_norm) >= 9 else len(vel_norm) // 2 * 2 + 1
+    window_a = 15 if len(acc_norm) >= 15 else len(acc_norm) // 2 * 2 + 1
+
+    vel_smooth = savgol_filter(vel_norm, window_length=window_v, polyorder=3, axis=0)
+    acc_smooth = savgol_filter(acc_norm, window_length=window_a, polyorder=3, axis=0)
+
+    return found, vel_smooth, acc_smooth
 
 # --- Plotting ---
-for path in files:
-    name = os.path.basename(path).replace("_final_clean.csv", "")
+def _job(path: str) -> None:
+    """Save the velocity and acceleration plot for one trajectory file."""
+
+    name = os.path.basename(path).replace("_final_clean.npz", "")
     print(f"\n📈 Plotting scalar curves for: {name}")
 
     try:
-        df = pd.read_csv(path, delimiter=DELIMITER)
-        time = df["Frame"].values  # 0–100 (% of motion)
+        time, ids, pos = load_positions(path)  # time: 0–100 (% of motion)
 
         fig, (ax_v, ax_a) = plt.subplots(2, 1, figsize=(10, 6), sharex=True)
         fig.suptitle(f"{name} – Betrag von Geschwindigkeit und Beschleunigung", fontsize=14)
 
-        for marker_id in MARKERS:
-            v, a = compute_scalar_velocity_and_acceleration(df, marker_id)
-            if v is not None and a is not None:
-                ax_v.plot(time, v, label=f"Marker {marker_id}")
-                ax_a.plot(time, a, label=f"Marker {marker_id}")
+        found, v, a = compute_scalar_velocity_and_acceleration(pos, ids, MARKERS)
+        for i, marker_id in enumerate(found):
+            ax_v.plot(time, v[:, i], label=f"Marker {marker_id}")
+            ax_a.plot(time, a[:, i], label=f"Marker {marker_id}")
 
         ax_v.set_title("Geschwindigkeit (||v||)")
         ax_a.set_title("Beschleunigung (||a||)")
@@ -80,3 +83,11 @@ for path in files:
 
     except Exception as e:
         print(f"❌ Failed for {name}: {e}")
+
+# --- Setup ---
+if __name__ == "__main__":
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    files = glob(f"{INPUT_DIR}/*_final_clean.npz")
+
+    with mp.get_context("spawn").Pool(mp.cpu_count()) as pool:
+        pool.map(_job, files)
@@ -8,6 +8,7 @@ import re
 input_file = "input.csv"
 output_file = "filled_but_preserved.csv"
 base_markers = list(range(1, 6))  # markers 1 to 5
+_MARKER_RE = re.compile(r"\*(\d+)")  # marker header cells like "*1"
 
 # --- STEP 1: Load raw data ---
 df_raw = pd.read_csv(input_file, sep=';', header=None, dtype=str)
@@ -31,7 +32,7 @@ for col_val, coord in zip(marker_row, coord_row):
         new_cols.append("Frame")
         continue
 
-    m = re.match(r"\*(\d+)", col_val)
+    m = _MARKER_RE.match(col_val)
     if m:
         current_marker = m.group(1)
 
@@ -45,21 +46,16 @@ df = df_raw.iloc[coord_hdr_idx + 1:].copy()
 df.columns = new_cols
 
 # --- STEP 5: Convert number columns safely without stripping decimals ---
-def parse_val(val):
-    try:
-        # keep decimal part, remove spaces, ignore thousand separators
-        val = str(val).replace(" ", "")
-        # If numbers look like "127.228.226", assume it's a German thousand separator: remove the first dots
-        parts = val.split(".")
-        if len(parts) > 2:
-            val = "".join(parts[:-1]) + "." + parts[-1]
-        return float(val)
-    except:
-        return np.nan
-
-for col in df.columns:
-    if col != "Frame":
-        df[col] = df[col].apply(parse_val)
+# keep decimal part, remove spaces, ignore thousand separators
+# If numbers look like "127.228.226", assume it's a German thousand separator: remove the first dots
+num_cols = [c for c in df.columns if c != "Frame"]
+block = df[num_cols].apply(
+    lambda s: pd.to_numeric(
+        s.str.replace(" ", "", regex=False).str.replace(r"\.(?=.*\.)", "", regex=True),
+        errors="coerce",
+    )
+)
+df[num_cols] = block
 
 # --- STEP 6: Determine all marker numbers ---
 all_markers = sorted({int(c.split("_")[0]) for c in df.columns if c != "Frame"})
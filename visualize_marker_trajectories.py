@@ -26,37 +26,39 @@ def detect_markers(columns):
 
 
 def load_marker_data(csv_path):
+    """Return marker IDs and a ``(frames, markers, 3)`` float32 position array.
+
+    Frames stay aligned across markers; invalid (NaN/Inf) samples are stored
+    as NaN so matplotlib simply leaves them out.
+    """
     df = pd.read_csv(csv_path, delimiter=DELIMITER)
 
     # Convert all data to numeric (coerce errors to NaN)
     df = df.apply(pd.to_numeric, errors='coerce')
 
-    marker_ids = detect_markers(df.columns)
-    marker_data = {}
+    marker_ids = []
+    for marker_id in detect_markers(df.columns):
+        if all(f"{marker_id}_{axis}" in df.columns for axis in AXES):
+            marker_ids.append(marker_id)
+        else:
+            print(f"❗ Marker {marker_id} fehlt in Datei: {csv_path}")
 
-    for marker_id in marker_ids:
-        try:
-            x = df[f"{marker_id}_X"].values
-            y = df[f"{marker_id}_Y"].values
-            z = df[f"{marker_id}_Z"].values
-            coords = np.vstack((x, y, z)).T
+    cols = [f"{marker_id}_{axis}" for marker_id in marker_ids for axis in AXES]
+    positions = df[cols].to_numpy(dtype=np.float32, copy=True).reshape(len(df), len(marker_ids), 3)
 
-            # Remove invalid rows
-            coords = coords[~np.isnan(coords).any(axis=1)]
-            coords = coords[~np.isinf(coords).any(axis=1)]
+    # Mark invalid samples in one pass
+    valid = np.isfinite(positions).all(axis=-1)
+    positions[~valid] = np.nan
 
-            if coords.size == 0:
-                print(f"⚠️ Alle Werte von Marker {marker_id} sind ungültig.")
-                continue
+    keep = valid.any(axis=0)
+    for marker_id in np.asarray(marker_ids)[~keep]:
+        print(f"⚠️ Alle Werte von Marker {marker_id} sind ungültig.")
 
-            marker_data[marker_id] = coords
-        except KeyError:
-            print(f"❗ Marker {marker_id} fehlt in Datei: {csv_path}")
-    return marker_data
+    return [m for m, k in zip(marker_ids, keep) if k], positions[:, keep]
 
 
-def animate_markers(marker_data, title="Marker Trajectories"):
-    if not marker_data:
+def animate_markers(marker_ids, positions, title="Marker Trajectories"):
+    if not marker_ids:
         print("❌ Keine gültigen Markerdaten zum Anzeigen.")
         return
 
@@ -64,36 +66,25 @@ def animate_markers(marker_data, title="Marker Trajectories"):
     ax = fig.add_subplot(111, projection='3d')
     ax.set_title(title)
 
-    # Concatenate all coordinates into one array (even if only one marker)
-    all_coords = np.concatenate([v for v in marker_data.values()], axis=0)
-
-    if np.isnan(all_coords).any() or np.isinf(all_coords).any():
-        print("❌ Ungültige Werte (NaN/Inf) in Koordinatendaten!")
-        print(all_coords)
-        return
-
-    ax.set_xlim(np.min(all_coords[:, 0]), np.max(all_coords[:, 0]))
-    ax.set_ylim(np.min(all_coords[:, 1]), np.max(all_coords[:, 1]))
-    ax.set_zlim(np.min(all_coords[:, 2]), np.max(all_coords[:, 2]))
-
-    points = {mid: ax.plot([], [], [], 'o', label=f'Marker {mid}')[0] for mid in marker_data}
-    trails = {mid: ax.plot([], [], [], '-', alpha=0.4)[0] for mid in marker_data}
+    ax.set_xlim(np.nanmin(positions[..., 0]), np.nanmax(positions[..., 0]))
+    ax.set_ylim(np.nanmin(positions[..., 1]), np.nanmax(positions[..., 1]))
+    ax.set_zlim(np.nanmin(positions[..., 2]), np.nanmax(positions[..., 2]))
 
-    max_frames = min(len(data) for data in marker_data.values())
+    points = [ax.plot([], [], [], 'o', label=f'Marker {mid}')[0] for mid in marker_ids]
+    trails = [ax.plot([], [], [], '-', alpha=0.4)[0] for mid in marker_ids]
 
     def update(frame):
-        for mid, data in marker_data.items():
-            if frame < len(data):
-                x, y, z = data[frame]
-                trail_data = data[:frame + 1]
-                points[mid].set_data([x], [y])
-                points[mid].set_3d_properties([z])
-                trails[mid].set_data(trail_data[:, 0], trail_data[:, 1])
-                trails[mid].set_3d_properties(trail_data[:, 2])
-        return list(points.values()) + list(trails.values())
+        for mid_index in range(len(marker_ids)):
+            x, y, z = positions[frame, mid_index]
+            trail_data = positions[:frame + 1, mid_index]
+            points[mid_index].set_data([x], [y])
+            points[mid_index].set_3d_properties([z])
+            trails[mid_index].set_data(trail_data[:, 0], trail_data[:, 1])
+            trails[mid_index].set_3d_properties(trail_data[:, 2])
+        return points + trails
 
     ax.legend()
-    ani = FuncAnimation(fig, update, frames=max_frames, interval=50, blit=True)
+    ani = FuncAnimation(fig, update, frames=len(positions), interval=50, blit=True)
     plt.show()
 
 
@@ -107,5 +98,5 @@ if __name__ == "__main__":
         exit(1)
 
     print(f"🎬 Visualisiere: {args.csv}")
-    marker_data = load_marker_data(args.csv)
-    animate_markers(marker_data, title=os.path.basename(args.csv))
+    marker_ids, positions = load_marker_data(args.csv)
+    animate_markers(marker_ids, positions, title=os.path.basename(args.csv))